@@ -5,10 +5,15 @@ Red Hat Summit Connect 2025
 Enhanced version with better error handling, improved visuals, and additional features.
 """
 
+import copy
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from IPython.display import display, HTML, clear_output
+import numpy as np
 import pandas as pd
 from ipywidgets import widgets
-from typing import Optional, Dict, List
+from typing import Any, Iterable, Optional, Dict, List
 
 
 class ShieldMetrics:
@@ -30,6 +35,24 @@ class ShieldMetrics:
         else:
             self.allowed += 1
 
+    @classmethod
+    def from_results(cls, store: "ShieldResultStore") -> "ShieldMetrics":
+        """Build metrics directly from a result store"""
+        metrics = cls()
+        blocked = store.column("blocked")
+        metrics.attempts = len(store)
+        metrics.blocked = int(blocked.sum())
+        metrics.allowed = metrics.attempts - metrics.blocked
+
+        categories = store.categories("pii_type")
+        codes = store.column("pii_type")[blocked]
+        # First-seen order, matching record()
+        _, first_seen = np.unique(codes, return_index=True)
+        metrics.pii_types_detected = [
+            categories[code] for code in codes[np.sort(first_seen)] if code >= 0
+        ]
+        return metrics
+
     def display(self):
         """Display current metrics"""
         if self.attempts == 0:
@@ -97,6 +120,168 @@ class ShieldMetrics:
         """
 
 
+class ShieldResultStore:
+    """Append-only, column-oriented store of shield verdicts
+
+    Each field lives in one NumPy array that grows geometrically, and the
+    string fields (configuration, prompt id, PII type) are interned as integer
+    codes. The PII types a shield actually detected are kept as a bitmask over
+    their own vocabulary. Holding millions of verdicts costs a few bytes per
+    verdict instead of one Python object each. ``to_frame`` wraps the numeric
+    arrays without copying.
+    """
+
+    _NUMERIC_COLUMNS = {
+        "blocked": np.bool_,
+        "error": np.bool_,
+        "score": np.float32,
+        "latency_ms": np.float32,
+        "detector_calls": np.uint32,
+        "detected": np.uint64,
+    }
+    _INTERNED_COLUMNS = ("config", "prompt_id", "pii_type")
+    _MAX_DETECTED_TYPES = 64
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._capacity = max(capacity, 1)
+        self._columns = {
+            name: np.zeros(self._capacity, dtype=dtype)
+            for name, dtype in self._NUMERIC_COLUMNS.items()
+        }
+        self._columns.update({
+            name: np.full(self._capacity, -1, dtype=np.int8)
+            for name in self._INTERNED_COLUMNS
+        })
+        self._vocab = {name: {} for name in self._INTERNED_COLUMNS}
+        self._detected_vocab = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _code_dtype(n_categories: int):
+        """Narrowest code dtype pandas uses for this many categories"""
+        if n_categories < np.iinfo(np.int8).max:
+            return np.int8
+        if n_categories < np.iinfo(np.int16).max:
+            return np.int16
+        return np.int32
+
+    def _intern(self, column: str, value: Optional[str]) -> int:
+        """Code for a string value, widening the code column when needed"""
+        if value is None:
+            return -1
+        vocab = self._vocab[column]
+        code = vocab.get(value)
+        if code is None:
+            code = vocab[value] = len(vocab)
+            dtype = self._code_dtype(len(vocab))
+            if self._columns[column].dtype != dtype:
+                self._columns[column] = self._columns[column].astype(dtype)
+        return code
+
+    def _detected_mask(self, detected_types) -> int:
+        """Bitmask for a set of detected PII types"""
+        mask = 0
+        for detected_type in detected_types:
+            bit = self._detected_vocab.get(detected_type)
+            if bit is None:
+                if len(self._detected_vocab) == self._MAX_DETECTED_TYPES:
+                    raise ValueError(
+                        f"At most {self._MAX_DETECTED_TYPES} distinct detected types are supported"
+                    )
+                bit = self._detected_vocab[detected_type] = len(self._detected_vocab)
+            mask |= 1 << bit
+        return mask
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        self._capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.full(self._capacity, -1 if name in self._vocab else 0, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def append(self, config: str, prompt_id: str, blocked: bool, latency_ms: float,
+               detector_calls: int = 1, score: Optional[float] = None,
+               pii_type: Optional[str] = None, error: bool = False,
+               detected_types: Iterable[str] = ()):
+        """Record one shield verdict"""
+        if self._size == self._capacity:
+            self._grow()
+        i = self._size
+        columns = self._columns
+        columns["config"][i] = self._intern("config", config)
+        columns["prompt_id"][i] = self._intern("prompt_id", prompt_id)
+        columns["pii_type"][i] = self._intern("pii_type", pii_type)
+        columns["blocked"][i] = blocked
+        columns["error"][i] = error
+        columns["score"][i] = np.nan if score is None else score
+        columns["latency_ms"][i] = latency_ms
+        columns["detector_calls"][i] = detector_calls
+        columns["detected"][i] = self._detected_mask(detected_types)
+        self._size += 1
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a column; interned columns return their codes"""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def detected(self, detected_type: str) -> np.ndarray:
+        """Boolean array marking verdicts that detected the given PII type"""
+        bit = self._detected_vocab.get(detected_type)
+        if bit is None:
+            return np.zeros(self._size, dtype=bool)
+        return (self.column("detected") & np.uint64(1 << bit)) != 0
+
+    def categories(self, name: str) -> List[str]:
+        """Values of an interned column, indexed by code"""
+        return list(self._vocab[name])
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame view of the stored verdicts
+
+        Numeric columns are zero-copy views of the store. Interned fields
+        become categoricals; pandas keeps the store's code array underneath
+        (``frame[name].array.codes``), but ``.cat.codes`` and most operations
+        return copies, so categorical columns are not zero-copy in practice.
+        Later appends never touch rows already exposed, so the frame stays
+        valid as the store grows.
+        """
+        data = {
+            name: pd.Categorical.from_codes(
+                self.column(name), categories=pd.Index(self.categories(name), dtype=object),
+                validate=False,
+            )
+            for name in self._INTERNED_COLUMNS
+        }
+        data.update({name: self.column(name) for name in self._NUMERIC_COLUMNS})
+        return pd.DataFrame(data, copy=False)
+
+    def aggregate(self, by: str = "config") -> pd.DataFrame:
+        """Verdict counts, block rate, latency and call totals per group
+
+        Verdicts without a value for ``by`` (e.g. clean prompts when grouping
+        by PII type) are reported under "none".
+        """
+        frame = self.to_frame()
+        grouped = frame.groupby(by, observed=True, dropna=False)
+        summary = grouped.agg(
+            messages=("blocked", "size"),
+            blocked=("blocked", "sum"),
+            detector_calls=("detector_calls", "sum"),
+            mean_latency_ms=("latency_ms", "mean"),
+            p95_latency_ms=("latency_ms", lambda latency: latency.quantile(0.95)),
+            mean_score=("score", "mean"),
+            errors=("error", "sum"),
+        )
+        summary["block_rate"] = summary["blocked"] / summary["messages"]
+        summary.index = summary.index.astype(object).fillna("none")
+        return summary
+
+
 def show_hero_banner():
     """Display the main demo banner"""
     display(HTML("""
@@ -274,18 +459,7 @@ def show_result_card(title: str, status: str, message: str, details: Optional[st
     display(HTML(html))
 
 
-def show_comparison_matrix():
-    """Create a visual matrix showing protection levels"""
-
-    scenarios = [
-        ("📧 Email PII", "john@example.com", False, "high"),
-        ("🔢 SSN", "123-45-6789", False, "critical"),
-        ("💳 Credit Card", "4532-1234-5678-9010", False, "critical"),
-        ("📋 Multiple PII", "email + SSN + card", False, "critical"),
-        ("✅ Safe Query", "How do I reset password?", True, "none")
-    ]
-
-    html = """
+_COMPARISON_TABLE_STYLE = """
     <style>
     .comparison-table { 
         width: 100%; 
@@ -358,6 +532,16 @@ def show_comparison_matrix():
         font-size: 13px;
         box-shadow: 0 2px 4px rgba(76,175,80,0.3);
     }
+    .no-data {
+        background: #9e9e9e;
+        color: white;
+        padding: 6px 14px;
+        border-radius: 16px;
+        display: inline-block;
+        font-weight: 600;
+        font-size: 13px;
+        box-shadow: 0 2px 4px rgba(158,158,158,0.3);
+    }
     .risk-badge {
         padding: 4px 10px;
         border-radius: 12px;
@@ -371,6 +555,30 @@ def show_comparison_matrix():
     .risk-high { background: #fff3cd; color: #856404; }
     .risk-none { background: #e8f5e9; color: #2e7d32; }
     </style>
+"""
+
+
+def show_comparison_matrix(evaluation: Optional["ShieldEvaluation"] = None,
+                           recall_target: float = 0.95):
+    """Create a visual matrix showing protection levels
+
+    Without an evaluation the illustrative expected outcomes are shown. Pass the
+    result of ``run_shield_evaluation`` to render the measured per-PII-type
+    recall, false-positive rate and cost of every configuration instead.
+    """
+    if evaluation is not None:
+        _show_measured_comparison_matrix(evaluation, recall_target)
+        return
+
+    scenarios = [
+        ("📧 Email PII", "john@example.com", False, "high"),
+        ("🔢 SSN", "123-45-6789", False, "critical"),
+        ("💳 Credit Card", "4532-1234-5678-9010", False, "critical"),
+        ("📋 Multiple PII", "email + SSN + card", False, "critical"),
+        ("✅ Safe Query", "How do I reset password?", True, "none")
+    ]
+
+    html = _COMPARISON_TABLE_STYLE + """
     <table class="comparison-table">
     <thead>
         <tr>
@@ -432,6 +640,142 @@ def show_comparison_matrix():
     display(HTML(html))
 
 
+_PII_SCENARIOS = {
+    "email": ("📧 Email PII", "high"),
+    "ssn": ("🔢 SSN", "critical"),
+    "credit_card": ("💳 Credit Card", "critical"),
+}
+
+
+def _show_measured_comparison_matrix(evaluation: "ShieldEvaluation", recall_target: float):
+    """Render the measured confusion matrix and cost of each shield configuration"""
+    matrix = evaluation.confusion_matrix()
+    cost = evaluation.cost()
+    configs = list(cost.index)
+    recommended = evaluation.recommend(recall_target)
+    col_width = 75 / max(len(configs), 1)
+
+    header = "".join(
+        f"<th style='width: {col_width:.2f}%; text-align: center;'>"
+        f"{name}{' (Recommended)' if name == recommended else ''}</th>"
+        for name in configs
+    )
+    html = _COMPARISON_TABLE_STYLE + f"""
+    <table class="comparison-table">
+    <thead>
+        <tr>
+            <th style='width: 25%;'>Attack Scenario</th>
+            {header}
+        </tr>
+    </thead>
+    <tbody>
+    """
+
+    for pii_type in matrix.index.get_level_values("pii_type").unique():
+        label, risk_level = _PII_SCENARIOS.get(
+            pii_type, (f"🔍 {pii_type.replace('_', ' ').title()}", "high")
+        )
+        cells = ""
+        for name in configs:
+            row = matrix.loc[(name, pii_type)]
+            cells += (
+                f"<td style='text-align: center;'>"
+                f"{_recall_badge(row['recall'], row['complete'], recall_target)}</td>"
+            )
+        positives = int(evaluation.corpus[pii_type].sum())
+        html += f"""
+        <tr>
+            <td>
+                <strong style='font-size: 15px;'>{label}</strong>
+                <span class='risk-badge risk-{risk_level}'>{risk_level}</span><br>
+                <small style='color: #999; font-size: 13px;'>recall over {positives} labeled prompts</small>
+            </td>
+            {cells}
+        </tr>
+        """
+
+    fp_cells = "".join(
+        f"<td style='text-align: center;'>{_false_positive_badge(cost.loc[name, 'false_positive_rate'])}</td>"
+        for name in configs
+    )
+    cost_cells = "".join(
+        f"<td style='text-align: center; color: #555; font-size: 13px;'>"
+        f"{_latency_label(cost.loc[name, 'mean_latency_ms'])}<br>"
+        f"{int(cost.loc[name, 'detector_calls'])} detector calls</td>"
+        for name in configs
+    )
+    html += f"""
+        <tr>
+            <td>
+                <strong style='font-size: 15px;'>✅ Safe Query</strong>
+                <span class='risk-badge risk-none'>none</span><br>
+                <small style='color: #999; font-size: 13px;'>false-positive rate</small>
+            </td>
+            {fp_cells}
+        </tr>
+        <tr>
+            <td><strong style='font-size: 15px;'>⏱️ Cost</strong></td>
+            {cost_cells}
+        </tr>
+    </tbody>
+    </table>
+    """
+
+    if recommended:
+        insight = (
+            f"<strong>{recommended}</strong> is the cheapest configuration that meets the "
+            f"{recall_target:.0%} recall target on every PII type "
+            f"({cost.loc[recommended, 'mean_latency_ms']:.0f} ms average latency, "
+            f"{int(cost.loc[recommended, 'detector_calls'])} detector calls)."
+        )
+    else:
+        insight = (
+            f"No configuration meets the {recall_target:.0%} recall target on every PII type. "
+            f"Consider lowering the confidence threshold or adding detectors."
+        )
+
+    html += f"""
+    <div style='margin-top: 25px; padding: 20px; background: #e3f2fd; border-left: 5px solid #2196f3; 
+                border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.08);'>
+        <div style='font-weight: 600; color: #1565c0; font-size: 17px; margin-bottom: 10px;'>
+            ⚡ Measured Result
+        </div>
+        <div style='color: #555; font-size: 15px; line-height: 1.6;'>
+            {insight}
+        </div>
+    </div>
+    """
+
+    display(HTML(html))
+
+
+def _recall_badge(recall: float, complete: bool, recall_target: float) -> str:
+    """Badge for the share of labeled PII prompts a configuration detected"""
+    if not complete:
+        return "<span class='no-data'>❓ No data / errored</span>"
+    if recall >= recall_target:
+        return f"<span class='blocked'>🛡️ {recall:.0%}</span>"
+    if recall > 0:
+        return f"<span class='partial'>⚠️ {recall:.0%}</span>"
+    return "<span class='allowed'>❌ EXPOSED</span>"
+
+
+def _latency_label(latency_ms: float) -> str:
+    """Average latency, or a placeholder when every verdict errored"""
+    if pd.isna(latency_ms):
+        return "no data"
+    return f"{latency_ms:.0f} ms avg"
+
+
+def _false_positive_badge(rate: float) -> str:
+    """Badge for the share of safe prompts a configuration blocked"""
+    if pd.isna(rate):
+        return "<span class='no-data'>❓ No data / errored</span>"
+    if rate == 0:
+        return "<span class='safe-allowed'>✅ Allowed</span>"
+    return f"<span class='partial'>⚠️ {rate:.0%} blocked</span>"
+
+
 def show_compliance_savings():
     """Show financial impact of preventing data breaches"""
     html = """
@@ -692,4 +1036,325 @@ SHIELD_CONFIG = {
             }
         }
     }
-}
\ No newline at end of file
+}
+
+# Shield configurations compared by run_shield_evaluation
+EVAL_CONFIGS = [
+    {"name": "Regex only", "shield_id": "eval_regex", "detectors": ["regex"], "threshold": 0.8},
+    {"name": "HAP only", "shield_id": "eval_hap", "detectors": ["hap"], "threshold": 0.5},
+    {"name": "Regex + HAP", "shield_id": "eval_regex_hap", "detectors": ["regex", "hap"], "threshold": 0.5},
+    {"name": "Regex + HAP (0.8)", "shield_id": "eval_regex_hap_strict", "detectors": ["regex", "hap"], "threshold": 0.8},
+    {"name": "HAP only (0.3)", "shield_id": "eval_hap_sensitive", "detectors": ["hap"], "threshold": 0.3},
+]
+
+_DETECTOR_PARAMS = {
+    "regex": {"regex": ["email", "ssn", "credit-card"]},
+    "hap": {},
+}
+
+# PII types a "multiple" prompt is labeled with
+_MULTIPLE_PII_TYPES = ["email", "ssn", "credit_card"]
+
+
+def build_shield_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Build shield registration kwargs for one evaluation configuration"""
+    shield = copy.deepcopy(SHIELD_CONFIG)
+    shield["shield_id"] = config["shield_id"]
+    shield["provider_shield_id"] = config["shield_id"]
+    shield["params"]["confidence_threshold"] = config["threshold"]
+    shield["params"]["detectors"] = {
+        detector: {"detector_params": copy.deepcopy(_DETECTOR_PARAMS[detector])}
+        for detector in config["detectors"]
+    }
+    return shield
+
+
+def _pii_labels(entry: Dict[str, Any]) -> List[str]:
+    """PII types present in a test prompt"""
+    if entry.get("pii_types"):
+        return list(entry["pii_types"])
+    if entry.get("pii_type") == "multiple":
+        return list(_MULTIPLE_PII_TYPES)
+    if entry.get("pii_type"):
+        return [entry["pii_type"]]
+    return []
+
+
+def build_eval_corpus(prompts: Optional[Dict[str, Dict[str, Any]]] = None) -> pd.DataFrame:
+    """Build a labeled corpus with one boolean column per PII type
+
+    Defaults to ``TEST_PROMPTS``. Entries may set ``pii_types`` to list every PII
+    type they contain; otherwise ``pii_type`` is used.
+    """
+    prompts = TEST_PROMPTS if prompts is None else prompts
+    labels = {prompt_id: _pii_labels(entry) for prompt_id, entry in prompts.items()}
+    pii_types = list(dict.fromkeys(t for types in labels.values() for t in types))
+
+    corpus = pd.DataFrame(
+        {"prompt": [entry["prompt"] for entry in prompts.values()]},
+        index=pd.Index(list(prompts), name="prompt_id"),
+    )
+    for pii_type in pii_types:
+        corpus[pii_type] = [pii_type in labels[prompt_id] for prompt_id in corpus.index]
+    return corpus
+
+
+class ShieldEvaluation:
+    """Measured shield verdicts for a labeled corpus across configurations
+
+    Derived tables are computed once and cached until the store grows.
+    """
+
+    def __init__(self, store: ShieldResultStore, corpus: pd.DataFrame, config_names: List[str]):
+        self.store = store
+        self.corpus = corpus
+        self.config_names = config_names
+        self._cache = {}
+
+    def _cached(self, key: str, compute):
+        """Cached value of ``compute()``, recomputed when the store has grown"""
+        size, value = self._cache.get(key, (None, None))
+        if size != len(self.store):
+            value = compute()
+            self._cache[key] = (len(self.store), value)
+        return value
+
+    @property
+    def results(self) -> pd.DataFrame:
+        return self._cached("results", self.store.to_frame)
+
+    @property
+    def pii_types(self) -> List[str]:
+        return [column for column in self.corpus.columns if column != "prompt"]
+
+    def _labeled_results(self) -> pd.DataFrame:
+        """Successful verdicts joined with their labels and detected PII types"""
+        return self._cached("labeled", self._compute_labeled_results)
+
+    def _compute_labeled_results(self) -> pd.DataFrame:
+        results = self.results
+        ok = ~results["error"].to_numpy()
+        labeled = results[ok].join(self.corpus[self.pii_types], on="prompt_id")
+        labeled["clean"] = ~labeled[self.pii_types].any(axis=1)
+        for pii_type in self.pii_types:
+            labeled[f"detected_{pii_type}"] = self.store.detected(pii_type)[ok]
+        return labeled
+
+    def confusion_matrix(self) -> pd.DataFrame:
+        """Per-configuration, per-PII-type detection counts and recall
+
+        A prompt counts as a true positive for a PII type only when the shield
+        reported detecting that type, not merely because it blocked the prompt.
+        ``complete`` is False when some labeled positives have no successful
+        verdict. False positives come from clean prompts and are not specific
+        to a PII type, so they are reported per configuration by ``cost()``.
+        """
+        return self._cached("matrix", self._compute_confusion_matrix)
+
+    def _compute_confusion_matrix(self) -> pd.DataFrame:
+        labeled = self._labeled_results()
+        long = labeled.melt(
+            id_vars=["config"], value_vars=self.pii_types,
+            var_name="pii_type", value_name="present",
+        )
+        # melt stacks one column after another, matching column-major order
+        long["detected"] = (
+            labeled[[f"detected_{t}" for t in self.pii_types]].to_numpy().ravel(order="F")
+        )
+        long = long[long["present"]]
+        detected = long["detected"]
+
+        counts = pd.DataFrame({
+            "config": long["config"],
+            "pii_type": long["pii_type"],
+            "tp": detected,
+            "fn": ~detected,
+        }).groupby(["config", "pii_type"], observed=True).sum()
+        counts = counts.reindex(
+            pd.MultiIndex.from_product([self.config_names, self.pii_types], names=["config", "pii_type"]),
+            fill_value=0,
+        )
+
+        positives = self.corpus[self.pii_types].sum()
+        counts["positives"] = positives.reindex(counts.index.get_level_values("pii_type")).to_numpy()
+        counts["complete"] = (counts["tp"] + counts["fn"]) == counts["positives"]
+        counts["recall"] = counts["tp"] / (counts["tp"] + counts["fn"])
+        return counts
+
+    def cost(self) -> pd.DataFrame:
+        """Latency, call count and headline accuracy per configuration
+
+        Latency covers successful verdicts only. ``false_positive_rate`` is the
+        share of clean prompts blocked. ``min_recall`` is NaN when any PII type
+        has unscored positives, so the configuration cannot qualify.
+        """
+        return self._cached("cost", self._compute_cost)
+
+    def _compute_cost(self) -> pd.DataFrame:
+        cost = self.results.groupby("config", observed=True).agg(
+            messages=("blocked", "size"),
+            detector_calls=("detector_calls", "sum"),
+            errors=("error", "sum"),
+        )
+        cost.index = cost.index.astype(object)
+        cost = cost.reindex(self.config_names)
+
+        labeled = self._labeled_results()
+        latency = labeled.groupby("config", observed=True)["latency_ms"]
+        cost["mean_latency_ms"] = latency.mean()
+        cost["p95_latency_ms"] = latency.quantile(0.95)
+        clean = labeled[labeled["clean"]].groupby("config", observed=True)["blocked"]
+        cost["false_positives"] = clean.sum().reindex(self.config_names, fill_value=0)
+        cost["false_positive_rate"] = clean.mean()
+
+        matrix = self.confusion_matrix()
+        recall = matrix["recall"].where(matrix["complete"])
+        incomplete = recall.isna().groupby(level="config").any()
+        cost["min_recall"] = recall.groupby(level="config").min().mask(incomplete)
+        return cost
+
+    def recommend(self, recall_target: float = 0.95) -> Optional[str]:
+        """Cheapest configuration whose recall meets the target on every PII type"""
+        cost = self.cost()
+        eligible = cost[cost["min_recall"] >= recall_target]
+        if eligible.empty:
+            return None
+        return eligible.sort_values(["detector_calls", "mean_latency_ms"]).index[0]
+
+
+def _detection_results(result) -> List[Dict[str, Any]]:
+    """Per-message and per-detector results reported by a shield violation"""
+    metadata = getattr(result.violation, "metadata", None)
+    if not metadata:
+        return []
+    detections = []
+    for message in metadata.get("results") or []:
+        detections.append(message)
+        detections.extend(message.get("individual_detector_results") or [])
+    return detections
+
+
+def _detected_pii_types(result, labels: List[str]) -> List[str]:
+    """PII types the shield reported detecting
+
+    The regex detector reports a generic "pii" detection type for the whole
+    prompt, so a "pii" violation credits every labeled PII type of the prompt.
+    Other detection types (e.g. HAP's "sequence_classification") credit none.
+    """
+    for detection in _detection_results(result):
+        if detection.get("status") == "violation" and detection.get("detection_type") == "pii":
+            return list(labels)
+    return []
+
+
+def _detection_score(result) -> Optional[float]:
+    """Highest confidence score the shield reported, if any"""
+    scores = [
+        detection["score"] for detection in _detection_results(result)
+        if detection.get("score") is not None
+    ]
+    return max(scores) if scores else None
+
+
+def _run_eval_job(client, config: Dict[str, Any], prompt_id: str, prompt: str,
+                  pii_type: Optional[str], labels: List[str]) -> Dict[str, Any]:
+    """Run one prompt through one configuration and time it
+
+    Each completed call runs every configured detector on the one message;
+    errored calls count no detector calls.
+    """
+    start = time.perf_counter()
+    detector_calls = 0
+    detected_types = []
+    score = None
+    try:
+        result = client.safety.run_shield(
+            shield_id=config["shield_id"],
+            messages=[{"role": "user", "content": prompt}],
+            params={}
+        )
+        blocked = bool(result.violation and result.violation.violation_level == 'error')
+        error = False
+        detector_calls = len(config["detectors"])
+        detected_types = _detected_pii_types(result, labels)
+        score = _detection_score(result)
+    except Exception:
+        blocked = False
+        error = True
+
+    return {
+        "config": config["name"],
+        "prompt_id": prompt_id,
+        "blocked": blocked,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "detector_calls": detector_calls,
+        "score": score,
+        "pii_type": pii_type,
+        "error": error,
+        "detected_types": detected_types,
+    }
+
+
+# Jobs queued per worker thread during an evaluation sweep
+_IN_FLIGHT_PER_WORKER = 4
+
+
+def _register_eval_shields(client, configs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Register each configuration's shield, returning those that succeeded"""
+    registered = []
+    for config in configs:
+        try:
+            client.shields.register(**build_shield_config(config))
+        except Exception as e:
+            show_result_card(
+                "❌ Shield Registration Failed",
+                "error",
+                f"Skipping <strong>{config['name']}</strong> "
+                f"(<code>{config['shield_id']}</code>) in this evaluation.",
+                str(e)[:200]
+            )
+            continue
+        registered.append(config)
+    return registered
+
+
+def run_shield_evaluation(client, configs: Optional[List[Dict[str, Any]]] = None,
+                          prompts: Optional[Dict[str, Dict[str, Any]]] = None,
+                          max_workers: int = 8, register: bool = True) -> ShieldEvaluation:
+    """Run a labeled corpus through several shield configurations in parallel
+
+    Each configuration is registered as its own shield (see ``EVAL_CONFIGS``)
+    and every prompt is sent to every shield; configurations whose shield
+    fails to register are skipped. Pass the result to
+    ``show_comparison_matrix`` to render the measured matrix.
+    """
+    prompts = TEST_PROMPTS if prompts is None else prompts
+    configs = EVAL_CONFIGS if configs is None else configs
+    corpus = build_eval_corpus(prompts)
+
+    if register:
+        configs = _register_eval_shields(client, configs)
+
+    labels = {prompt_id: _pii_labels(entry) for prompt_id, entry in prompts.items()}
+    jobs = (
+        (config, prompt_id, entry["prompt"], entry.get("pii_type"), labels[prompt_id])
+        for config in configs
+        for prompt_id, entry in prompts.items()
+    )
+    store = ShieldResultStore(capacity=len(configs) * len(prompts))
+
+    # Keep a bounded window of in-flight jobs so large sweeps never hold one
+    # future per message; each verdict goes into the store as it completes.
+    max_in_flight = max_workers * _IN_FLIGHT_PER_WORKER
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        for job in jobs:
+            pending.add(pool.submit(_run_eval_job, client, *job))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store.append(**future.result())
+        for future in wait(pending).done:
+            store.append(**future.result())
+
+    return ShieldEvaluation(store, corpus, [config["name"] for config in configs])